@@ -17,15 +17,16 @@ REM Activate virtual environment
 echo Activating virtual environment...
 call venv\Scripts\activate.bat
 
-REM Install dependencies
-echo Installing dependencies...
-pip install httpx tqdm moviepy numpy
+REM Install the package; pip resolves the dependencies and creates the
+REM mtser.exe launcher from the pyproject.toml entry point
+echo Installing mtser...
+pip install .
 
 echo.
 echo ✅ Installation complete!
 echo.
 echo To use mtser:
 echo   1. Activate virtual environment: venv\Scripts\activate.bat
-echo   2. Run: python mtser.py --interactive
+echo   2. Run: mtser --interactive
 echo.
 pause
@@ -18,20 +18,14 @@ python3 -m venv venv
 echo "Activating virtual environment..."
 source venv/bin/activate
 
-# Install dependencies
-echo "Installing dependencies..."
-pip install httpx tqdm moviepy numpy
-
-# Make script executable
-chmod +x mtser.py
+# Install the package; pip resolves the dependencies and creates the
+# mtser launcher from the pyproject.toml entry point
+echo "Installing mtser..."
+pip install .
 
 echo ""
 echo "✅ Installation complete!"
 echo ""
 echo "To use mtser:"
 echo "  1. Activate virtual environment: source venv/bin/activate"
-echo "  2. Run: python mtser.py --interactive"
-echo ""
-echo "Or add alias to your shell:"
-echo "  echo 'alias mtser=\"$(pwd)/venv/bin/python $(pwd)/mtser.py\"' >> ~/.bashrc"
-echo "  source ~/.bashrc"
+echo "  2. Run: mtser --interactive"
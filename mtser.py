@@ -9,64 +9,202 @@ import os
 import sys
 import re
 import json
+import hashlib
+import asyncio
+import shutil
 import argparse
 import logging
-from typing import Dict, List, Optional, Tuple, Union
+import subprocess
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, NamedTuple, Optional, Tuple, Union
 from pathlib import Path
+from operator import itemgetter
 
 import httpx
 import tqdm
-import numpy as np
-
-# Try different import methods for moviepy
-try:
-    # Try new moviepy structure first
-    from moviepy import VideoFileClip, AudioFileClip, ColorClip, CompositeAudioClip, concatenate_videoclips
-    from moviepy.audio.AudioClip import AudioArrayClip
-except ImportError:
+
+# Timeline tuples are (start, end, filepath); sort on the start plane
+_BY_START = itemgetter(0)
+
+
+def _encoder_works(encoder: str) -> bool:
+    """Encode one test frame to prove the encoder can actually initialize."""
     try:
-        # Try old moviepy structure
-        from moviepy.editor import VideoFileClip, AudioFileClip, ColorClip, CompositeAudioClip, concatenate_videoclips
-        from moviepy.audio.AudioClip import AudioArrayClip
-    except ImportError:
-        print("Error: moviepy is not installed or has incompatible version.")
-        print("Please install moviepy with: pip install moviepy")
-        sys.exit(1)
+        result = subprocess.run(
+            ['ffmpeg', '-hide_banner', '-loglevel', 'error',
+             '-f', 'lavfi', '-i', 'color=c=black:s=256x256:d=0.1',
+             '-frames:v', '1', '-c:v', encoder, '-f', 'null', '-'],
+            capture_output=True, text=True
+        )
+    except FileNotFoundError:
+        return False
+    return result.returncode == 0
+
+
+@functools.lru_cache(maxsize=None)
+def _detect_video_encoder() -> str:
+    """Pick a hardware H.264 encoder when the local ffmpeg offers one.
+
+    The -encoders listing only reflects compile-time support (distro and
+    static builds list h264_nvenc on machines without the GPU), so each
+    candidate must also survive a one-frame test encode before being
+    selected.
+    """
+    try:
+        result = subprocess.run(
+            ['ffmpeg', '-hide_banner', '-encoders'],
+            capture_output=True, text=True
+        )
+    except FileNotFoundError:
+        return 'libx264'
+
+    for candidate in ('h264_nvenc', 'h264_videotoolbox', 'h264_qsv'):
+        if candidate in result.stdout and _encoder_works(candidate):
+            return candidate
+    return 'libx264'
+
+
+# Gap fillers must share the segments' codec so the concat demuxer can
+# stream-copy them; these map ffprobe codec names to a matching encoder
+_FILLER_VIDEO_ENCODERS = {
+    'h264': 'libx264',
+    'hevc': 'libx265',
+    'mpeg4': 'mpeg4',
+    'vp8': 'libvpx',
+    'vp9': 'libvpx-vp9',
+}
+_FILLER_AUDIO_ENCODERS = {
+    'aac': 'aac',
+    'mp3': 'libmp3lame',
+    'opus': 'libopus',
+    'vorbis': 'libvorbis',
+}
+_SILENCE_SUFFIXES = {
+    'libmp3lame': '.mp3',
+    'libopus': '.opus',
+    'libvorbis': '.ogg',
+}
+
+
+def _parse_frame_rate(rate: Optional[str]) -> float:
+    """Parse an ffprobe r_frame_rate fraction such as '30000/1001'."""
+    try:
+        num, _, den = (rate or '').partition('/')
+        return float(num) / float(den or 1)
+    except (ValueError, ZeroDivisionError):
+        return 0.0
+
+
+def _zero_copy(src: Path, dst: Path):
+    """Copy a file kernel-to-kernel via sendfile, bypassing userspace.
+
+    Falls back to a buffered copy on platforms without os.sendfile
+    (notably Windows).
+    """
+    with open(src, 'rb') as fin, open(dst, 'wb') as fout:
+        if hasattr(os, 'sendfile'):
+            size = os.fstat(fin.fileno()).st_size
+            offset = 0
+            while offset < size:
+                sent = os.sendfile(fout.fileno(), fin.fileno(), offset, size - offset)
+                if sent == 0:
+                    break
+                offset += sent
+        else:
+            shutil.copyfileobj(fin, fout, length=1024 * 1024)
+
+
+# Precompiled URL patterns; these run for every validated/processed URL
+_URL_EXTRACT_PATTERNS = [
+    re.compile(r'^https://my\.mts-link\.ru/(?:[^/]+/)?\d+/\d+/record-new/(\d+)(?:/record-file/(\d+))?$'),
+    re.compile(r'^https://my\.mts-link\.ru/\d+/\d+/record-new/(\d+)(?:/record-file/(\d+))?$'),
+]
+_URL_VALIDATE_PATTERNS = [
+    re.compile(r'^https://my\.mts-link\.ru/(?:[^/]+/)?\d+/\d+/record-new/\d+(?:/record-file/\d+)?$'),
+]
 
 
 class MTSLinkerDownloader:
     """Handles downloading of webinar data and media files."""
 
+    # Files above this size are split into parallel ranged requests
+    RANGED_MIN_SIZE = 16 * 1024 * 1024
+
+    # Maximum number of segment downloads in flight on the asyncio path
+    ASYNC_CONCURRENCY = 16
+
+    # Accumulate this many bytes before refreshing a progress bar; small
+    # enough that typical webinar segments still update while in flight
+    PBAR_FLUSH_BYTES = 256 * 1024
+
+    # Browser-like headers for API requests
+    SESSION_HEADERS = {
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+        'Accept': 'application/json, text/plain, */*',
+        'Accept-Language': 'en-US,en;q=0.9',
+        'Accept-Encoding': 'gzip, deflate, br',
+        'Origin': 'https://my.mts-link.ru',
+        'Referer': 'https://my.mts-link.ru/',
+        'Sec-Fetch-Dest': 'empty',
+        'Sec-Fetch-Mode': 'cors',
+        'Sec-Fetch-Site': 'same-origin',
+        'Cache-Control': 'no-cache',
+        'Pragma': 'no-cache',
+        'Connection': 'keep-alive',
+    }
+
+    # Video-specific headers for media downloads
+    MEDIA_HEADERS = {
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+        'Accept': 'video/mp4,video/webm,video/ogg,application/octet-stream,*/*;q=0.8',
+        'Accept-Language': 'en-US,en;q=0.9',
+        'Accept-Encoding': 'gzip, deflate, br',
+        'Referer': 'https://my.mts-link.ru/',
+        'Origin': 'https://events-storage.webinar.ru',
+        'Sec-Fetch-Dest': 'video',
+        'Sec-Fetch-Mode': 'no-cors',
+        'Sec-Fetch-Site': 'cross-site',
+        'Range': 'bytes=0-',  # Support for resumable downloads
+    }
+
     def __init__(self, timeout: float = 60.0):
         self.timeout = httpx.Timeout(timeout)
-        self.session = httpx.Client(
-            timeout=self.timeout,
-            headers={
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                'Accept': 'application/json, text/plain, */*',
-                'Accept-Language': 'en-US,en;q=0.9',
-                'Accept-Encoding': 'gzip, deflate, br',
-                'Origin': 'https://my.mts-link.ru',
-                'Referer': 'https://my.mts-link.ru/',
-                'Sec-Fetch-Dest': 'empty',
-                'Sec-Fetch-Mode': 'cors',
-                'Sec-Fetch-Site': 'same-origin',
-                'Cache-Control': 'no-cache',
-                'Pragma': 'no-cache',
-                'Connection': 'keep-alive',
-            },
-            follow_redirects=True
+        self.limits = httpx.Limits(
+            max_connections=32,
+            max_keepalive_connections=16,
+            keepalive_expiry=30
         )
 
+        # HTTP/2 multiplexes parallel segment fetches over one TLS handshake,
+        # but it needs the optional h2 package (pip install httpx[http2])
+        try:
+            self.session = self._build_session(http2=True)
+        except ImportError:
+            logging.debug("h2 package not installed, falling back to HTTP/1.1")
+            self.session = self._build_session(http2=False)
+
+    def _build_session(self, http2: bool) -> httpx.Client:
+        return httpx.Client(http2=http2, **self._client_kwargs())
+
+    def _build_async_session(self) -> 'httpx.AsyncClient':
+        try:
+            return httpx.AsyncClient(http2=True, **self._client_kwargs())
+        except ImportError:
+            return httpx.AsyncClient(**self._client_kwargs())
+
+    def _client_kwargs(self) -> Dict:
+        return {
+            'timeout': self.timeout,
+            'limits': self.limits,
+            'headers': self.SESSION_HEADERS,
+            'follow_redirects': True,
+        }
+
     def extract_ids_from_url(self, url: str) -> Tuple[Optional[str], Optional[str]]:
         """Extract event_sessions and record_id from MTS Link URL."""
-        patterns = [
-            r'^https://my\.mts-link\.ru/(?:[^/]+/)?\d+/\d+/record-new/(\d+)(?:/record-file/(\d+))?$',
-            r'^https://my\.mts-link\.ru/\d+/\d+/record-new/(\d+)(?:/record-file/(\d+))?$'
-        ]
-
-        for pattern in patterns:
-            match = re.match(pattern, url)
+        for pattern in _URL_EXTRACT_PATTERNS:
+            match = pattern.match(url)
             if match:
                 event_sessions = match.group(1)
                 record_id = match.group(2) if match.group(2) else None
@@ -76,12 +214,8 @@ class MTSLinkerDownloader:
 
     def validate_url(self, url: str) -> bool:
         """Validate if URL matches MTS Link pattern."""
-        patterns = [
-            r'^https://my\.mts-link\.ru/(?:[^/]+/)?\d+/\d+/record-new/\d+(?:/record-file/\d+)?$',
-        ]
-
-        for pattern in patterns:
-            if re.match(pattern, url):
+        for pattern in _URL_VALIDATE_PATTERNS:
+            if pattern.match(url):
                 return True
 
         return False
@@ -124,21 +258,7 @@ class MTSLinkerDownloader:
             return True
 
         try:
-            # Add video-specific headers for media downloads
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                'Accept': 'video/mp4,video/webm,video/ogg,application/octet-stream,*/*;q=0.8',
-                'Accept-Language': 'en-US,en;q=0.9',
-                'Accept-Encoding': 'gzip, deflate, br',
-                'Referer': 'https://my.mts-link.ru/',
-                'Origin': 'https://events-storage.webinar.ru',
-                'Sec-Fetch-Dest': 'video',
-                'Sec-Fetch-Mode': 'no-cors',
-                'Sec-Fetch-Site': 'cross-site',
-                'Range': 'bytes=0-',  # Support for resumable downloads
-            }
-
-            with self.session.stream('GET', url, headers=headers) as response:
+            with self.session.stream('GET', url, headers=self.MEDIA_HEADERS) as response:
                 response.raise_for_status()
 
                 total_size = int(response.headers.get('content-length', 0))
@@ -146,7 +266,7 @@ class MTSLinkerDownloader:
                 # Ensure directory exists
                 save_path.parent.mkdir(parents=True, exist_ok=True)
 
-                with open(save_path, 'wb') as f:
+                with open(save_path, 'wb', buffering=1024 * 1024) as f:
                     with tqdm.tqdm(
                             total=total_size,
                             unit='B',
@@ -154,9 +274,17 @@ class MTSLinkerDownloader:
                             desc=f'Downloading {save_path.name}',
                             leave=False
                     ) as pbar:
-                        for chunk in response.iter_bytes(chunk_size=8192):
+                        # 1 MiB chunks keep the copy loop out of the interpreter;
+                        # progress updates are batched to amortize refreshes
+                        pending = 0
+                        for chunk in response.iter_bytes(chunk_size=1024 * 1024):
                             f.write(chunk)
-                            pbar.update(len(chunk))
+                            pending += len(chunk)
+                            if pending >= self.PBAR_FLUSH_BYTES:
+                                pbar.update(pending)
+                                pending = 0
+                        if pending:
+                            pbar.update(pending)
 
                 return True
 
@@ -166,22 +294,291 @@ class MTSLinkerDownloader:
                 save_path.unlink()  # Remove partial download
             return False
 
+    def _probe_range_support(self, url: str) -> Tuple[bool, int]:
+        """Check whether the server accepts byte ranges and report file size."""
+        try:
+            response = self.session.head(url)
+            response.raise_for_status()
+        except httpx.HTTPError:
+            return False, 0
+
+        size = int(response.headers.get('content-length', 0))
+        supported = response.headers.get('accept-ranges', '').lower() == 'bytes'
+        return supported, size
+
+    def download_file_ranged(self, url: str, save_path: Path, parts: int = 4) -> bool:
+        """Download a file with parallel HTTP Range requests when supported.
+
+        A single TCP connection caps throughput at one connection's receive
+        window, so large files are split into contiguous byte ranges fetched
+        concurrently and written with positional (lock-free) os.pwrite calls.
+        Falls back to the single-stream download_file path for small files or
+        servers that do not accept ranges.
+        """
+        if save_path.exists():
+            logging.info(f"File already exists: {save_path.name}")
+            return True
+
+        supported, size = self._probe_range_support(url)
+        if (not supported or size < self.RANGED_MIN_SIZE
+                or parts <= 1 or not hasattr(os, 'pwrite')):
+            return self.download_file(url, save_path)
+
+        save_path.parent.mkdir(parents=True, exist_ok=True)
+        bounds = [(i * size // parts, (i + 1) * size // parts - 1) for i in range(parts)]
+
+        try:
+            with open(save_path, 'wb') as f:
+                f.truncate(size)  # Preallocate so workers can write in place
+                fd = f.fileno()
+
+                with tqdm.tqdm(
+                        total=size,
+                        unit='B',
+                        unit_scale=True,
+                        desc=f'Downloading {save_path.name}',
+                        leave=False
+                ) as pbar:
+                    def fetch_part(part_bounds: Tuple[int, int]):
+                        start, end = part_bounds
+                        offset = start
+                        headers = {'Range': f'bytes={start}-{end}'}
+                        pending = 0
+                        with self.session.stream('GET', url, headers=headers) as response:
+                            response.raise_for_status()
+                            for chunk in response.iter_bytes(chunk_size=1024 * 1024):
+                                os.pwrite(fd, chunk, offset)
+                                offset += len(chunk)
+                                pending += len(chunk)
+                                if pending >= self.PBAR_FLUSH_BYTES:
+                                    pbar.update(pending)
+                                    pending = 0
+                        if pending:
+                            pbar.update(pending)
+
+                    with ThreadPoolExecutor(max_workers=parts) as executor:
+                        list(executor.map(fetch_part, bounds))
+
+            return True
+
+        except Exception as e:
+            logging.error(f"Error downloading {url}: {e}")
+            if save_path.exists():
+                save_path.unlink()  # Remove partial download
+            return False
+
+    def download_files(self, downloads: List[Tuple[str, Path]], parallelism: int = 4) -> None:
+        """Download many files concurrently.
+
+        Drives an asyncio event loop (accelerated by uvloop when installed)
+        so hundreds of small segments can be in flight without a thread
+        stack each. Falls back to a thread pool when a fresh event loop
+        cannot be started, e.g. when called from async code.
+        """
+        if not downloads:
+            return
+
+        try:
+            import uvloop
+            uvloop.install()
+        except ImportError:
+            pass
+
+        try:
+            asyncio.run(self._download_files_async(downloads))
+        except RuntimeError:
+            with ThreadPoolExecutor(max_workers=parallelism) as executor:
+                list(executor.map(lambda item: self.download_file_ranged(*item), downloads))
+
+    async def _download_files_async(self, downloads: List[Tuple[str, Path]]) -> None:
+        """Fetch all planned downloads over a shared AsyncClient."""
+        loop = asyncio.get_event_loop()
+        semaphore = asyncio.Semaphore(self.ASYNC_CONCURRENCY)
+
+        async with self._build_async_session() as client:
+
+            async def fetch(url: str, save_path: Path):
+                async with semaphore:
+                    if save_path.exists():
+                        logging.info(f"File already exists: {save_path.name}")
+                        return
+
+                    # Large range-capable files still go through the
+                    # multipart pwrite path, off the event loop
+                    supported, size = await loop.run_in_executor(
+                        None, self._probe_range_support, url)
+                    if supported and size >= self.RANGED_MIN_SIZE and hasattr(os, 'pwrite'):
+                        await loop.run_in_executor(
+                            None, self.download_file_ranged, url, save_path)
+                    else:
+                        await self._download_file_async(client, url, save_path)
+
+            await asyncio.gather(*(fetch(url, path) for url, path in downloads))
+
+    async def _download_file_async(self, client: 'httpx.AsyncClient', url: str, save_path: Path) -> bool:
+        """Async single-stream download with progress bar."""
+        try:
+            save_path.parent.mkdir(parents=True, exist_ok=True)
+
+            async with client.stream('GET', url, headers=self.MEDIA_HEADERS) as response:
+                response.raise_for_status()
+
+                total_size = int(response.headers.get('content-length', 0))
+
+                with open(save_path, 'wb', buffering=1024 * 1024) as f:
+                    with tqdm.tqdm(
+                            total=total_size,
+                            unit='B',
+                            unit_scale=True,
+                            desc=f'Downloading {save_path.name}',
+                            leave=False
+                    ) as pbar:
+                        pending = 0
+                        async for chunk in response.aiter_bytes(chunk_size=1024 * 1024):
+                            f.write(chunk)
+                            pending += len(chunk)
+                            if pending >= self.PBAR_FLUSH_BYTES:
+                                pbar.update(pending)
+                                pending = 0
+                        if pending:
+                            pbar.update(pending)
+
+            return True
+
+        except Exception as e:
+            logging.error(f"Error downloading {url}: {e}")
+            if save_path.exists():
+                save_path.unlink()  # Remove partial download
+            return False
+
     def close(self):
         """Close the HTTP session."""
         self.session.close()
 
 
+class SegmentPlan(NamedTuple):
+    """A single webinar segment scheduled for download and assembly."""
+    url: str
+    filepath: Path
+    start_time: float
+
+
+class ConcatEntry(NamedTuple):
+    """One entry of an ffmpeg concat demuxer list."""
+    path: Path
+    outpoint: Optional[float] = None
+
+
+class StreamParams(NamedTuple):
+    """Per-stream codec parameters that must match for a lossless concat."""
+    video: Optional[Tuple] = None  # (codec, width, height, pix_fmt, frame rate)
+    audio: Optional[Tuple] = None  # (codec, sample rate, channels, layout)
+
+
 class WebinarProcessor:
-    """Processes downloaded webinar segments into a final video."""
+    """Processes downloaded webinar segments into a final video using ffmpeg."""
+
+    # Gaps shorter than this are ignored rather than filled
+    GAP_TOLERANCE = 0.1
 
-    def __init__(self, output_dir: Union[str, Path]):
+    def __init__(self, output_dir: Union[str, Path], parallelism: int = 4):
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.parallelism = parallelism
+        self._intermediate_files: List[Path] = []
+        self._codec_params_cache: Dict[Path, Optional[Tuple]] = {}
+
+    def _run_ffmpeg(self, args: List[str]) -> bool:
+        """Run an ffmpeg command, returning True on success."""
+        cmd = ['ffmpeg', '-y', '-hide_banner', '-loglevel', 'error'] + args
+        logging.debug(f"Running: {' '.join(cmd)}")
+        try:
+            result = subprocess.run(cmd, capture_output=True, text=True)
+        except FileNotFoundError:
+            logging.error("ffmpeg not found. Please install ffmpeg and ensure it is in PATH.")
+            return False
+
+        if result.returncode != 0:
+            logging.debug(f"ffmpeg failed: {result.stderr.strip()}")
+            return False
+        return True
+
+    def _probe_media(self, filepath: Path) -> Tuple[Optional[str], float]:
+        """Classify a media file as 'video' or 'audio' and return its duration."""
+        cmd = [
+            'ffprobe', '-v', 'error',
+            '-show_entries', 'stream=codec_type:format=duration',
+            '-of', 'json', str(filepath)
+        ]
+        try:
+            result = subprocess.run(cmd, capture_output=True, text=True)
+            if result.returncode != 0:
+                return None, 0.0
+            info = json.loads(result.stdout)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None, 0.0
+
+        duration = float(info.get('format', {}).get('duration', 0) or 0)
+        codec_types = {s.get('codec_type') for s in info.get('streams', [])}
+
+        if 'video' in codec_types:
+            return 'video', duration
+        if 'audio' in codec_types:
+            return 'audio', duration
+        return None, duration
 
     def sanitize_filename(self, name: str) -> str:
         """Sanitize string to be safe for filenames."""
         return re.sub(r'[<>:"/\\|?*\s]+', '_', name).strip('_')
 
+    def _plan_segments(self, event_logs: List) -> List[SegmentPlan]:
+        """Build one SegmentPlan per valid event log entry.
+
+        URL parsing and the fallback filename hash run exactly once per
+        entry here instead of once per traversal pass.
+        """
+        plans = []
+
+        for event in event_logs:
+            if not isinstance(event, dict):
+                continue
+
+            data = event.get('data')
+            if not data or not isinstance(data, dict):
+                continue
+
+            url = data.get('url')
+            if not url:
+                continue
+
+            # Extract filename from URL
+            filename = os.path.basename(url.split('?')[0])
+            if not filename:
+                # If no filename in URL, generate one from the URL hash;
+                # blake2b with an 8-byte digest is faster than MD5 and short
+                filename_hash = hashlib.blake2b(url.encode(), digest_size=8).hexdigest()
+                filename = f"segment_{filename_hash}.mp4"
+
+            start_time = float(event.get('relativeTime', 0))
+            plans.append(SegmentPlan(url, self.output_dir / filename, start_time))
+
+        return plans
+
+    def _plan_downloads(self, plans: List[SegmentPlan]) -> List[Tuple[str, Path]]:
+        """Deduplicate segment plans into the (url, filepath) pairs to download."""
+        downloads = []
+        seen = set()
+
+        for plan in plans:
+            if plan.filepath in seen:
+                continue
+            seen.add(plan.filepath)
+
+            if not plan.filepath.exists():
+                downloads.append((plan.url, plan.filepath))
+
+        return downloads
+
     def download_and_process_segments(self, json_data: Dict, downloader: MTSLinkerDownloader) -> Tuple[List, List, float]:
         """Download all segments and process them into video and audio clips."""
         video_clips = []
@@ -199,160 +596,304 @@ class WebinarProcessor:
             if isinstance(event_logs[0], dict):
                 logging.debug(f"First event_log keys: {event_logs[0].keys()}")
 
-        # First pass: download all files
-        for event in event_logs:
-            if not isinstance(event, dict):
-                continue
+        # Plan once, then download all files in parallel (network-bound)
+        plans = self._plan_segments(event_logs)
+        downloads = self._plan_downloads(plans)
+        downloader.download_files(downloads, parallelism=self.parallelism)
 
-            data = event.get('data')
-            if not data or not isinstance(data, dict):
+        # Classify the downloaded files into video and audio timelines
+        for plan in plans:
+            if not plan.filepath.exists():
+                logging.warning(f"File not found: {plan.filepath.name}")
                 continue
 
-            url = data.get('url')
-            if not url:
-                continue
+            kind, duration = self._probe_media(plan.filepath)
+            if kind == 'video':
+                video_clips.append((plan.start_time, plan.start_time + duration, plan.filepath))
+            elif kind == 'audio':
+                audio_clips.append((plan.start_time, plan.start_time + duration, plan.filepath))
+            else:
+                logging.warning(f"Could not identify {plan.filepath.name} as video or audio")
 
-            # Extract filename from URL
-            url_parts = url.split('?')[0]
-            filename = os.path.basename(url_parts)
-            if not filename:
-                # If no filename in URL, generate one from the URL hash
-                import hashlib
-                filename_hash = hashlib.md5(url.encode()).hexdigest()[:16]
-                filename = f"segment_{filename_hash}.mp4"
+        # Keep both timelines pre-sorted so downstream passes sort in O(n)
+        video_clips.sort(key=_BY_START)
+        audio_clips.sort(key=_BY_START)
 
-            filepath = self.output_dir / filename
+        return video_clips, audio_clips, total_duration
 
-            if not filepath.exists():
-                logging.info(f"Downloading: {filename}")
-                downloader.download_file(url, filepath)
+    def _video_encoder_args(self) -> List[str]:
+        """Encoder flags for the re-encode fallbacks.
 
-        # Second pass: process downloaded files
-        for event in event_logs:
-            if not isinstance(event, dict):
-                continue
+        Uses a hardware H.264 encoder when ffmpeg reports one; for libx264
+        the preset defaults to ultrafast and can be overridden through the
+        MTSER_PRESET environment variable.
+        """
+        codec = _detect_video_encoder()
+        args = ['-c:v', codec]
+        if codec == 'libx264':
+            args += [
+                '-preset', os.environ.get('MTSER_PRESET', 'ultrafast'),
+                '-tune', 'fastdecode',
+            ]
+        return args + ['-pix_fmt', 'yuv420p']
+
+    def _probe_codec_params(self, filepath: Path) -> Optional[StreamParams]:
+        """Fetch the stream parameters that must match for lossless concat."""
+        if filepath in self._codec_params_cache:
+            return self._codec_params_cache[filepath]
+
+        cmd = [
+            'ffprobe', '-v', 'error',
+            '-show_entries',
+            'stream=codec_type,codec_name,width,height,pix_fmt,r_frame_rate,'
+            'sample_rate,channels,channel_layout',
+            '-of', 'json', str(filepath)
+        ]
+        params = None
+        try:
+            result = subprocess.run(cmd, capture_output=True, text=True)
+            if result.returncode == 0:
+                video = audio = None
+                for stream in json.loads(result.stdout).get('streams', []):
+                    if stream.get('codec_type') == 'video' and video is None:
+                        video = (
+                            stream.get('codec_name'),
+                            stream.get('width'),
+                            stream.get('height'),
+                            stream.get('pix_fmt'),
+                            stream.get('r_frame_rate'),
+                        )
+                    elif stream.get('codec_type') == 'audio' and audio is None:
+                        audio = (
+                            stream.get('codec_name'),
+                            stream.get('sample_rate'),
+                            stream.get('channels'),
+                            stream.get('channel_layout'),
+                        )
+                if video or audio:
+                    params = StreamParams(video, audio)
+        except (FileNotFoundError, json.JSONDecodeError):
+            pass
+
+        self._codec_params_cache[filepath] = params
+        return params
+
+    def _needs_gap_fill(self, video_clips: List, total_duration: float) -> bool:
+        """Check whether the timeline has holes or mixed codec parameters.
+
+        When the segments already cover the whole duration back-to-back and
+        share codec/resolution/pixel format, the gap-insertion machinery is
+        dead weight and a plain concat stream copy suffices.
+        """
+        current_time = 0.0
+        for start, end, _ in sorted(video_clips, key=_BY_START):
+            if start > current_time + self.GAP_TOLERANCE:
+                return True
+            current_time = max(current_time, end)
 
-            data = event.get('data')
-            if not data or not isinstance(data, dict):
-                continue
+        if current_time < total_duration - self.GAP_TOLERANCE:
+            return True
 
-            url = data.get('url')
-            start_time = event.get('relativeTime', 0)
+        params = {self._probe_codec_params(filepath) for _, _, filepath in video_clips}
+        return len(params) != 1 or None in params
 
-            if not url:
-                continue
+    def _black_master(self, video_params: Optional[Tuple]) -> Optional[Path]:
+        """Generate the single one-second black clip reused for all video gaps.
 
-            # Extract filename from URL
-            url_parts = url.split('?')[0]
-            filename = os.path.basename(url_parts)
-            if not filename:
-                # If no filename in URL, generate one from the URL hash
-                import hashlib
-                filename_hash = hashlib.md5(url.encode()).hexdigest()[:16]
-                filename = f"segment_{filename_hash}.mp4"
+        The clip copies the segments' probed codec, resolution, pixel
+        format and frame rate so it concatenates losslessly with them;
+        1920x1080 h264 at 24 fps is only the fallback when nothing could
+        be probed.
+        """
+        path = self.output_dir / '.black_1s.mp4'
+        if path.exists():
+            return path
+
+        codec, width, height, pix_fmt, rate = video_params or (None,) * 5
+        encoder = _FILLER_VIDEO_ENCODERS.get(codec, 'libx264')
+        size = f'{width or 1920}x{height or 1080}'
+        if not _parse_frame_rate(rate):
+            rate = '24'
+
+        # Every frame a keyframe (-g 1) so outpoint trims cut cleanly on copy
+        args = ['-f', 'lavfi', '-i', f'color=c=black:s={size}:r={rate}:d=1',
+                '-c:v', encoder]
+        if encoder == 'libx264':
+            args += ['-tune', 'stillimage', '-preset', 'ultrafast']
+        args += ['-g', '1', '-pix_fmt', pix_fmt or 'yuv420p', str(path)]
+
+        if not self._run_ffmpeg(args):
+            return None
+        self._intermediate_files.append(path)
+        return path
 
-            filepath = self.output_dir / filename
+    def _black_gap_entries(self, duration: float, video_params: Optional[Tuple]) -> List[ConcatEntry]:
+        """Expand a gap into repeated references to the cached black clip.
 
-            if not filepath.exists():
-                logging.warning(f"File not found: {filename}")
-                continue
+        The one-second master is referenced once per whole second, with the
+        fractional remainder trimmed via an outpoint directive, so every gap
+        shares one tiny encoded file instead of encoding a filler per
+        distinct duration.
+        """
+        master = self._black_master(video_params)
+        if not master:
+            return []
+
+        fps = (_parse_frame_rate(video_params[4]) if video_params else 0.0) or 24.0
+        entries = [ConcatEntry(master)] * int(duration)
+        remainder = duration - int(duration)
+        if remainder >= 1 / fps:
+            entries.append(ConcatEntry(master, outpoint=round(remainder, 3)))
+        return entries
+
+    def _make_silence_segment(self, duration: float, audio_params: Optional[Tuple]) -> Optional[Path]:
+        """Generate a silent audio clip matching the segments' probed format.
+
+        Sample rate, channel layout and codec follow the segments so the
+        silence concatenates losslessly instead of being dropped or
+        resampled by a re-encode over mismatched inputs; 44.1kHz stereo
+        AAC is only the fallback when nothing could be probed.
+        """
+        codec, sample_rate, channels, layout = audio_params or (None,) * 4
+        encoder = _FILLER_AUDIO_ENCODERS.get(codec, 'aac')
+        if not layout or layout == 'unknown':
+            layout = 'mono' if channels == 1 else 'stereo'
+        suffix = _SILENCE_SUFFIXES.get(encoder, '.m4a')
+
+        path = self.output_dir / f".silence_{int(round(duration * 1000))}ms{suffix}"
+        if path.exists():
+            return path
+
+        success = self._run_ffmpeg([
+            '-f', 'lavfi', '-t', f'{duration:.3f}',
+            '-i', f'anullsrc=r={sample_rate or 44100}:cl={layout}',
+            '-c:a', encoder, str(path)
+        ])
+        if not success:
+            return None
+        self._intermediate_files.append(path)
+        return path
 
-            try:
-                # Try to load as video
-                video_clip = VideoFileClip(str(filepath)).with_start(start_time)
-                video_clips.append(video_clip)
-            except Exception as e:
-                # If not video, try audio
-                try:
-                    audio_clip = AudioFileClip(str(filepath)).with_start(start_time)
-                    audio_clips.append(audio_clip)
-                except Exception as audio_error:
-                    logging.warning(f"Could not load {filename} as video or audio: {e}")
+    def _concat_segments(
+            self,
+            entries: List[ConcatEntry],
+            output_path: Path,
+            reencode_args: List[str]
+    ) -> Optional[Path]:
+        """Concatenate media files with the ffmpeg concat demuxer.
+
+        Stream-copies losslessly when every entry shares the same probed
+        stream parameters and re-encodes otherwise. The decision cannot
+        rest on the copy attempt's exit code: ffmpeg happily copies
+        mismatched segments into a single malformed stream and exits 0.
+        """
+        if len(entries) == 1 and entries[0].outpoint is None:
+            return entries[0].path
+
+        list_path = output_path.with_suffix('.txt')
+        with open(list_path, 'w', encoding='utf-8') as f:
+            for entry in entries:
+                escaped = str(entry.path.resolve()).replace("'", "'\\''")
+                f.write(f"file '{escaped}'\n")
+                if entry.outpoint is not None:
+                    f.write(f"outpoint {entry.outpoint:.3f}\n")
+        self._intermediate_files.append(list_path)
+
+        concat_input = ['-f', 'concat', '-safe', '0', '-i', str(list_path)]
+
+        # Stream copy is an O(bytes) remux, but it is only valid when the
+        # entries' parameters actually match
+        params = {self._probe_codec_params(entry.path) for entry in entries}
+        if len(params) == 1 and None not in params:
+            if self._run_ffmpeg(concat_input + ['-c', 'copy', str(output_path)]):
+                self._intermediate_files.append(output_path)
+                return output_path
+            logging.info("Stream copy failed, re-encoding...")
+        else:
+            logging.info("Segment parameters differ, re-encoding...")
 
-        return video_clips, audio_clips, total_duration
+        if self._run_ffmpeg(concat_input + reencode_args + [str(output_path)]):
+            self._intermediate_files.append(output_path)
+            return output_path
 
-    def create_video_with_gaps(self, total_duration: float, video_clips: List) -> VideoFileClip:
-        """Create final video with black gaps for missing segments."""
+        return None
+
+    def create_video_with_gaps(self, total_duration: float, video_clips: List) -> Optional[Path]:
+        """Create final video track with black gaps for missing segments."""
         if not video_clips:
             # Create blank video if no video clips
-            return ColorClip(size=(1920, 1080), color=(0, 0, 0), duration=total_duration)
+            entries = self._black_gap_entries(total_duration, None)
+            if not entries:
+                return None
+            return self._concat_segments(
+                entries,
+                self.output_dir / '.video_track.mp4',
+                self._video_encoder_args()
+            )
 
-        clips = []
+        entries = []
         current_time = 0.0
 
         # Sort clips by start time
-        video_clips.sort(key=lambda x: x.start)
-
-        for video in video_clips:
-            if video.start > current_time:
-                gap_duration = video.start - current_time
-                if gap_duration > 0:
-                    gap_clip = ColorClip(
-                        size=(1920, 1080),
-                        color=(0, 0, 0),
-                        duration=gap_duration
-                    ).with_start(current_time)
-                    clips.append(gap_clip)
-
-            clips.append(video)
-            current_time = max(current_time, video.end)
+        video_clips.sort(key=_BY_START)
+
+        # Black fillers mirror the first segment's parameters
+        probed = self._probe_codec_params(video_clips[0][2])
+        video_params = probed.video if probed else None
+
+        for start, end, filepath in video_clips:
+            if start > current_time + self.GAP_TOLERANCE:
+                entries.extend(self._black_gap_entries(start - current_time, video_params))
+
+            entries.append(ConcatEntry(filepath))
+            current_time = max(current_time, end)
 
         # Fill remaining gap at the end
-        if current_time < total_duration:
-            remaining_duration = total_duration - current_time
-            if remaining_duration > 0:
-                gap_clip = ColorClip(
-                    size=(1920, 1080),
-                    color=(0, 0, 0),
-                    duration=remaining_duration
-                ).with_start(current_time)
-                clips.append(gap_clip)
-
-        if not clips:
-            return ColorClip(size=(1920, 1080), color=(0, 0, 0), duration=total_duration)
-
-        return concatenate_videoclips(clips, method="compose")
-
-    def create_audio_with_gaps(self, total_duration: float, audio_clips: List) -> CompositeAudioClip:
-        """Create final audio with silence for gaps."""
+        if current_time < total_duration - self.GAP_TOLERANCE:
+            entries.extend(self._black_gap_entries(total_duration - current_time, video_params))
+
+        return self._concat_segments(
+            entries,
+            self.output_dir / '.video_track.mp4',
+            self._video_encoder_args() + ['-c:a', 'aac']
+        )
+
+    def create_audio_with_gaps(self, total_duration: float, audio_clips: List) -> Optional[Path]:
+        """Create final audio track with silence for gaps."""
         if not audio_clips:
             # Create silent audio
-            silent_audio = AudioArrayClip(
-                np.zeros((int(total_duration * 44100), 2)),
-                fps=44100
-            )
-            return CompositeAudioClip([silent_audio])
+            return self._make_silence_segment(total_duration, None)
 
-        segments = []
+        entries = []
         current_time = 0.0
 
         # Sort audio clips by start time
-        audio_clips.sort(key=lambda x: x.start)
+        audio_clips.sort(key=_BY_START)
 
-        for audio in audio_clips:
-            if audio.start > current_time:
-                gap_duration = audio.start - current_time
-                if gap_duration > 0:
-                    silence = AudioArrayClip(
-                        np.zeros((int(gap_duration * 44100), 2)),
-                        fps=44100
-                    ).with_start(current_time)
-                    segments.append(silence)
+        # Silence fillers mirror the first segment's parameters
+        probed = self._probe_codec_params(audio_clips[0][2])
+        audio_params = probed.audio if probed else None
 
-            segments.append(audio)
-            current_time = max(current_time, audio.end)
+        for start, end, filepath in audio_clips:
+            if start > current_time + self.GAP_TOLERANCE:
+                silence = self._make_silence_segment(start - current_time, audio_params)
+                if silence:
+                    entries.append(ConcatEntry(silence))
 
-        # Fill remaining silence at the end
-        if current_time < total_duration:
-            remaining_duration = total_duration - current_time
-            if remaining_duration > 0:
-                silence = AudioArrayClip(
-                    np.zeros((int(remaining_duration * 44100), 2)),
-                    fps=44100
-                ).with_start(current_time)
-                segments.append(silence)
+            entries.append(ConcatEntry(filepath))
+            current_time = max(current_time, end)
 
-        return CompositeAudioClip(segments)
+        # Fill remaining silence at the end
+        if current_time < total_duration - self.GAP_TOLERANCE:
+            silence = self._make_silence_segment(total_duration - current_time, audio_params)
+            if silence:
+                entries.append(ConcatEntry(silence))
+
+        return self._concat_segments(
+            entries,
+            self.output_dir / '.audio_track.m4a',
+            ['-c:a', 'aac']
+        )
 
     def compile_final_video(
             self,
@@ -364,57 +905,173 @@ class WebinarProcessor:
     ) -> bool:
         """Compile all segments into final video file."""
         try:
-            logging.info("Creating video with gaps...")
-            final_video = self.create_video_with_gaps(total_duration, video_clips)
+            # Fast path: contiguous segments with matching codec parameters
+            # concatenate straight into the output with a stream copy
+            if (video_clips and not audio_clips and not max_duration
+                    and not self._needs_gap_fill(video_clips, total_duration)):
+                logging.info("Segments are contiguous, concatenating directly...")
+                video_clips.sort(key=_BY_START)
+                output_path = self.output_dir / output_filename
+                result = self._concat_segments(
+                    [ConcatEntry(filepath) for _, _, filepath in video_clips],
+                    output_path,
+                    self._video_encoder_args() + ['-c:a', 'aac']
+                )
+                if result is not None:
+                    if result != output_path:
+                        _zero_copy(result, output_path)
+                    self._cleanup_intermediates(output_path)
+                    return True
+                logging.warning("Direct concatenation failed, rebuilding with gap fill")
 
-            if audio_clips:
-                logging.info("Creating audio with gaps...")
-                final_audio = self.create_audio_with_gaps(total_duration, audio_clips)
-                final_video = final_video.with_audio(final_audio)
+            output_path = self.output_dir / output_filename
 
             # Apply duration limit if specified
-            if max_duration and final_video.duration > max_duration:
+            limit_args = []
+            if max_duration and max_duration < total_duration:
                 logging.info(f"Truncating video to {max_duration} seconds")
-                final_video = final_video.subclip(0, max_duration)
-
-            # Write final video
-            output_path = self.output_dir / output_filename
-            logging.info(f"Writing final video to: {output_path}")
+                limit_args = ['-t', str(max_duration)]
 
-            # Try different parameter combinations for moviepy compatibility
-            try:
-                # Try with modern parameters first
-                final_video.write_videofile(
-                    str(output_path),
-                    codec='libx264',
-                    audio_codec='aac',
-                    fps=24,
-                    preset='medium',
-                    threads=os.cpu_count() or 4
-                )
-            except TypeError as e:
-                # If that fails, try with minimal parameters
-                logging.warning(f"Falling back to minimal parameters: {e}")
-                final_video.write_videofile(
-                    str(output_path),
-                    codec='libx264',
-                    audio_codec='aac',
-                    fps=24
-                )
-
-            # Clean up clips to free memory
-            final_video.close()
-            for clip in video_clips:
-                clip.close()
-            for clip in audio_clips:
-                clip.close()
+            logging.info("Creating video with gaps...")
+            video_track = self.create_video_with_gaps(total_duration, video_clips)
 
-            return True
+            audio_track = None
+            if audio_clips:
+                logging.info("Creating audio with gaps...")
+                audio_track = self.create_audio_with_gaps(total_duration, audio_clips)
+
+            success = False
+            if video_track and (audio_track or not audio_clips):
+                # Write final video
+                logging.info(f"Writing final video to: {output_path}")
+
+                mux_args = ['-i', str(video_track)]
+                if audio_track:
+                    # Separate audio clips replace any audio embedded in the video
+                    mux_args += ['-i', str(audio_track), '-map', '0:v:0', '-map', '1:a:0']
+
+                success = self._run_ffmpeg(mux_args + ['-c', 'copy'] + limit_args + [str(output_path)])
+                if not success:
+                    # If stream copy fails, re-encode to a known-good format
+                    logging.warning("Falling back to re-encoding final video")
+                    success = self._run_ffmpeg(
+                        mux_args
+                        + self._video_encoder_args() + ['-c:a', 'aac']
+                        + limit_args + [str(output_path)]
+                    )
+
+            if not success:
+                # Last resort: one re-encoding run over a generated filter graph
+                logging.warning("Concat assembly failed, re-encoding via generated filter graph")
+                success = self._compile_with_filter_graph(
+                    video_clips, audio_clips, total_duration, output_path, limit_args)
+
+            self._cleanup_intermediates(output_path)
+
+            return success
 
         except Exception as e:
             logging.error(f"Error compiling final video: {e}")
             return False
 
+    def _compile_with_filter_graph(
+            self,
+            video_clips: List,
+            audio_clips: List,
+            total_duration: float,
+            output_path: Path,
+            limit_args: List[str]
+    ) -> bool:
+        """Re-encode everything in one ffmpeg run from a generated filter graph.
+
+        The graph shape is fixed (segments, gap fillers, one output) and
+        varies only in counts and offsets, so it is generated once from the
+        sorted timelines and written to a script file; ffmpeg then does all
+        timeline math in C.
+        """
+        inputs: List[Path] = []
+        filters: List[str] = []
+
+        # Video branch: normalized segments interleaved with black sources
+        video_labels = []
+        current_time = 0.0
+        for start, end, filepath in sorted(video_clips, key=_BY_START):
+            if start > current_time + self.GAP_TOLERANCE:
+                label = f'g{len(video_labels)}'
+                filters.append(
+                    f'color=c=black:s=1920x1080:r=24:d={start - current_time:.3f}[{label}]')
+                video_labels.append(label)
+
+            index = len(inputs)
+            inputs.append(filepath)
+            label = f'v{index}'
+            # Scale preserving aspect ratio, pad to frame and force square
+            # pixels: concat hard-fails on inputs with differing SAR
+            filters.append(
+                f'[{index}:v]setpts=PTS-STARTPTS,'
+                f'scale=1920:1080:force_original_aspect_ratio=decrease,'
+                f'pad=1920:1080:-1:-1,setsar=1,fps=24[{label}]')
+            video_labels.append(label)
+            current_time = max(current_time, end)
+
+        if current_time < total_duration - self.GAP_TOLERANCE:
+            label = f'g{len(video_labels)}'
+            filters.append(
+                f'color=c=black:s=1920x1080:r=24:d={total_duration - current_time:.3f}[{label}]')
+            video_labels.append(label)
+
+        if not video_labels:
+            filters.append(f'color=c=black:s=1920x1080:r=24:d={total_duration:.3f}[outv]')
+        elif len(video_labels) == 1:
+            filters.append(f'[{video_labels[0]}]null[outv]')
+        else:
+            filters.append(
+                ''.join(f'[{label}]' for label in video_labels)
+                + f'concat=n={len(video_labels)}:v=1:a=0[outv]')
+
+        # Audio branch: clips delayed to their offsets, mixed over silence
+        audio_labels = []
+        for start, end, filepath in sorted(audio_clips, key=_BY_START):
+            index = len(inputs)
+            inputs.append(filepath)
+            delay_ms = int(start * 1000)
+            label = f'a{index}'
+            filters.append(f'[{index}:a]adelay={delay_ms}|{delay_ms}[{label}]')
+            audio_labels.append(label)
+
+        if audio_labels:
+            filters.append(f'anullsrc=r=44100:cl=stereo:d={total_duration:.3f}[abase]')
+            audio_labels.insert(0, 'abase')
+            filters.append(
+                ''.join(f'[{label}]' for label in audio_labels)
+                + f'amix=inputs={len(audio_labels)}:normalize=0[outa]')
+
+        script_path = self.output_dir / '.mtser_graph.txt'
+        with open(script_path, 'w', encoding='utf-8') as f:
+            f.write(';\n'.join(filters) + '\n')
+        self._intermediate_files.append(script_path)
+
+        args = []
+        for filepath in inputs:
+            args += ['-i', str(filepath)]
+        args += ['-filter_complex_script', str(script_path), '-map', '[outv]']
+        args += self._video_encoder_args()
+        if audio_labels:
+            args += ['-map', '[outa]', '-c:a', 'aac']
+        args += limit_args + [str(output_path)]
+
+        return self._run_ffmpeg(args)
+
+    def _cleanup_intermediates(self, output_path: Path):
+        """Delete gap clips, concat lists and track files left behind."""
+        for path in self._intermediate_files:
+            if path != output_path and path.exists():
+                try:
+                    path.unlink()
+                except OSError as e:
+                    logging.warning(f"Could not delete {path}: {e}")
+        self._intermediate_files.clear()
+
 
 def setup_logging(log_dir: str = "logs", quiet: bool = False, debug: bool = False):
     """Setup logging configuration."""
@@ -712,6 +1369,11 @@ Interactive mode:
 
     args = parser.parse_args()
 
+    # The whole processing pipeline shells out to ffmpeg/ffprobe
+    if not shutil.which('ffmpeg') or not shutil.which('ffprobe'):
+        sys.exit("Error: ffmpeg (with ffprobe) is required but was not found in PATH.\n"
+                 "Install it from https://ffmpeg.org/download.html")
+
     # Setup logging
     setup_logging(quiet=args.quiet, debug=args.debug)
 